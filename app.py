@@ -1,81 +1,98 @@
 import streamlit as st
+import copy
 from datetime import datetime
 from config import Config
 from service import InterviewService
 from models import InterviewSession
 
+# UI strings per language code
+I18N = {
+    "EN": {
+        "questions_completed": "Questions completed",
+        "correct_answers": "Correct answers",
+        "start_question": "Start New Question",
+        "question": "Question",
+        "your_answer": "Your Answer",
+        "submit": "Submit Answer",
+        "explanation": "Explanation",
+        "tips": "Tips for Improvement",
+        "correct": "Correct! 🎉",
+        "incorrect": "Not quite right.",
+        "session_completed": "Session completed! Check your progress in the sidebar.",
+        "next_question": "Next Question",
+        "select_topic": "Select Topic",
+        "select_difficulty": "Select Difficulty",
+        "your_progress": "Your Progress",
+        "current_level": "Current Level",
+        "confidence_score": "Confidence Score",
+        "recommended_topics": "Recommended Focus Areas"
+    },
+    "RU": {
+        "questions_completed": "Вопросов завершено",
+        "correct_answers": "Правильных ответов",
+        "start_question": "Начать новый вопрос",
+        "question": "Вопрос",
+        "your_answer": "Ваш ответ",
+        "submit": "Отправить ответ",
+        "explanation": "Объяснение",
+        "tips": "Советы для улучшения",
+        "correct": "Правильно! 🎉",
+        "incorrect": "Не совсем правильно.",
+        "session_completed": "Сессия завершена! Проверьте свой прогресс в боковой панели.",
+        "next_question": "Следующий вопрос",
+        "select_topic": "Выберите тему",
+        "select_difficulty": "Выберите уровень сложности",
+        "your_progress": "Ваш прогресс",
+        "current_level": "Текущий уровень",
+        "confidence_score": "Оценка уверенности",
+        "recommended_topics": "Рекомендуемые темы для изучения"
+    }
+}
+
+# Session state defaults, applied once per browser session
+SESSION_STATE_DEFAULTS = {
+    "current_question": None,
+    "questions_asked": 0,
+    "correct_answers": 0,
+    "improvement_areas": [],
+    "language": "EN",
+    "answer_submitted": False,
+    "needs_new_question": False,
+    "previous_questions": [],
+    "current_answer": "",
+    "next_question": None
+}
+
 def initialize_session_state():
-    if "current_question" not in st.session_state:
-        st.session_state.current_question = None
-    if "questions_asked" not in st.session_state:
-        st.session_state.questions_asked = 0
-    if "correct_answers" not in st.session_state:
-        st.session_state.correct_answers = 0
-    if "improvement_areas" not in st.session_state:
-        st.session_state.improvement_areas = []
-    if "language" not in st.session_state:
-        st.session_state.language = "EN"
-    if "answer_submitted" not in st.session_state:
-        st.session_state.answer_submitted = False
-    if "needs_new_question" not in st.session_state:
-        st.session_state.needs_new_question = False
-    if "previous_questions" not in st.session_state:
-        st.session_state.previous_questions = []
-    if "current_answer" not in st.session_state:
-        st.session_state.current_answer = ""
+    if st.session_state.get("_initialized"):
+        return
+    for key, value in SESSION_STATE_DEFAULTS.items():
+        # Copy mutable defaults so sessions don't share the same list
+        st.session_state.setdefault(key, copy.copy(value))
+    st.session_state._initialized = True
+
+@st.cache_resource
+def get_service():
+    # Shared across reruns and sessions to reuse the OpenAI connection pool
+    return InterviewService()
 
 def get_next_question():
     st.session_state.needs_new_question = True
     st.session_state.answer_submitted = False
     st.session_state.current_answer = ""  # Clear the answer
-    st.rerun()
+    st.rerun(scope="fragment")
 
-def main():
-    st.title("Data Science Interview Coach 🎓")
-    
-    # Initialize service and session state
-    service = InterviewService()
-    initialize_session_state()
-    
-    # Sidebar for settings
-    st.sidebar.header("Interview Settings")
-    
-    # Language selection
-    selected_language = st.sidebar.selectbox(
-        "Select Language / Выберите язык",
-        list(Config.LANGUAGES.keys()),
-        format_func=lambda x: x,
-        index=0 if st.session_state.language == "EN" else 1
-    )
-    st.session_state.language = Config.LANGUAGES[selected_language]
-    
-    # Topic and difficulty selection
-    selected_topic = st.sidebar.selectbox(
-        "Select Topic" if st.session_state.language == "EN" else "Выберите тему",
-        Config.TOPICS
-    )
-    difficulty = st.sidebar.selectbox(
-        "Select Difficulty" if st.session_state.language == "EN" else "Выберите уровень сложности",
-        Config.DIFFICULTY_LEVELS
-    )
-    
-    # Show previous progress if available
-    progress = service.get_topic_progress(selected_topic, st.session_state.language)
-    if progress:
-        st.sidebar.markdown("---")
-        st.sidebar.subheader("Your Progress" if st.session_state.language == "EN" else "Ваш прогресс")
-        st.sidebar.write(f"{'Current Level' if st.session_state.language == 'EN' else 'Текущий уровень'}: {progress.skill_level}")
-        st.sidebar.write(f"{'Confidence Score' if st.session_state.language == 'EN' else 'Оценка уверенности'}: {progress.confidence_score:.2f}")
-        st.sidebar.markdown("**" + ("Recommended Focus Areas" if st.session_state.language == "EN" else "Рекомендуемые темы для изучения") + ":**")
-        for topic in progress.recommended_topics:
-            st.sidebar.markdown(f"- {topic}")
+@st.fragment
+def question_fragment(service: InterviewService, selected_topic: str, difficulty: str):
+    # Answer input, submission and feedback rerun on their own without the sidebar
+    t = I18N[st.session_state.language]
     
     # Display current progress
     if st.session_state.questions_asked > 0:
         st.info(
-            f"{'Questions completed' if st.session_state.language == 'EN' else 'Вопросов завершено'}: "
+            f"{t['questions_completed']}: "
             f"{st.session_state.questions_asked}/{Config.QUESTIONS_PER_SESSION} | "
-            f"{'Correct answers' if st.session_state.language == 'EN' else 'Правильных ответов'}: "
+            f"{t['correct_answers']}: "
             f"{st.session_state.correct_answers}"
         )
     
@@ -85,31 +102,39 @@ def main():
         if st.session_state.current_question:
             st.session_state.previous_questions.append(st.session_state.current_question)
             
-        st.session_state.current_question = service.generate_question(
-            selected_topic,
-            difficulty,
-            st.session_state.language,
-            st.session_state.previous_questions
-        )
+        # Use the question prefetched while the user was reading feedback, if settings haven't changed
+        prefetched = st.session_state.next_question
+        st.session_state.next_question = None
+        if prefetched and prefetched[0] == (selected_topic, difficulty, st.session_state.language):
+            st.session_state.current_question = prefetched[1].result()
+        else:
+            if prefetched:
+                prefetched[1].cancel()
+            st.session_state.current_question = service.generate_question(
+                selected_topic,
+                difficulty,
+                st.session_state.language,
+                st.session_state.previous_questions
+            )
         st.session_state.needs_new_question = False
     
     # Main interview interface
     if st.session_state.current_question is None:
-        if st.button("Start New Question" if st.session_state.language == "EN" else "Начать новый вопрос"):
+        if st.button(t["start_question"]):
             st.session_state.needs_new_question = True
             st.session_state.previous_questions = []  # Reset previous questions for new session
             st.session_state.current_answer = ""  # Clear the answer
-            st.rerun()
+            st.rerun(scope="fragment")
     
     else:
         # Display current question
-        st.markdown("### " + ("Question" if st.session_state.language == "EN" else "Вопрос") + ":")
+        st.markdown("### " + t["question"] + ":")
         st.write(st.session_state.current_question.question_text)
         
         # Get user's answer with a key that changes when question changes
         answer_key = f"answer_{st.session_state.questions_asked}"
         user_answer = st.text_area(
-            "Your Answer" if st.session_state.language == "EN" else "Ваш ответ",
+            t["your_answer"],
             value=st.session_state.current_answer,
             key=answer_key
         )
@@ -121,53 +146,72 @@ def main():
         
         # Submit answer button
         if not st.session_state.answer_submitted:
-            if col1.button("Submit Answer" if st.session_state.language == "EN" else "Отправить ответ"):
+            if col1.button(t["submit"]):
+                # Placeholders for feedback, filled in as the evaluation streams
+                verdict_placeholder = st.empty()
+                st.markdown("### " + t["explanation"])
+                explanation_placeholder = st.empty()
+                st.markdown("### " + t["tips"])
+                tips_placeholder = st.empty()
+                
+                def show_partial_feedback(partial):
+                    if partial["explanation"]:
+                        explanation_placeholder.markdown(partial["explanation"])
+                    if partial["improvement_tips"]:
+                        tips_placeholder.markdown(partial["improvement_tips"])
+                
                 evaluation = service.evaluate_answer(
                     st.session_state.current_question,
                     user_answer,
-                    st.session_state.language
+                    st.session_state.language,
+                    on_partial=show_partial_feedback
                 )
                 
                 # Display feedback
                 if evaluation["is_correct"]:
-                    st.success("Correct! 🎉" if st.session_state.language == "EN" else "Правильно! 🎉")
+                    verdict_placeholder.success(t["correct"])
                     st.session_state.correct_answers += 1
                 else:
-                    st.error("Not quite right." if st.session_state.language == "EN" else "Не совсем правильно.")
-                
-                st.markdown("### " + ("Explanation" if st.session_state.language == "EN" else "Объяснение"))
-                st.write(evaluation["explanation"])
+                    verdict_placeholder.error(t["incorrect"])
                 
-                st.markdown("### " + ("Tips for Improvement" if st.session_state.language == "EN" else "Советы для улучшения"))
-                st.write(evaluation["improvement_tips"])
+                explanation_placeholder.write(evaluation["explanation"])
+                tips_placeholder.write(evaluation["improvement_tips"])
                 
                 # Update session stats
                 st.session_state.questions_asked += 1
                 if "improvement_tips" in evaluation:
-                    st.session_state.improvement_areas.append(evaluation["improvement_tips"])
+                    tips = evaluation["improvement_tips"]
+                    # The model may return tips as a list; sessions store one string per answer
+                    if isinstance(tips, list):
+                        tips = "\n".join(tips)
+                    st.session_state.improvement_areas.append(tips)
                 
                 st.session_state.answer_submitted = True
                 
                 # Check if session should end
                 if st.session_state.questions_asked >= Config.QUESTIONS_PER_SESSION:
+                    now = datetime.now()
+                    
                     # Save session data
                     session = InterviewSession(
                         topic=selected_topic,
-                        timestamp=datetime.now(),
+                        timestamp=now,
                         questions_asked=st.session_state.questions_asked,
                         correct_answers=st.session_state.correct_answers,
                         difficulty_level=difficulty,
                         language=st.session_state.language,
                         areas_for_improvement=st.session_state.improvement_areas
                     )
-                    service.save_session(session)
-                    
-                    # Update progress
-                    progress = service.analyze_performance(
+                    # Analyze performance while the session is being saved
+                    analysis = service.submit(service.aanalyze_performance(
                         selected_topic,
                         session,
                         st.session_state.language
-                    )
+                    ))
+                    service.save_session(session)
+                    
+                    # Update progress
+                    progress = analysis.result()
                     service.update_progress(progress)
                     
                     # Reset session state
@@ -180,17 +224,68 @@ def main():
                     st.session_state.previous_questions = []  # Reset previous questions list
                     st.session_state.current_answer = ""  # Clear the answer
                     
-                    st.success(
-                        "Session completed! Check your progress in the sidebar." 
-                        if st.session_state.language == "EN" 
-                        else "Сессия завершена! Проверьте свой прогресс в боковой панели."
-                    )
+                    st.success(t["session_completed"])
+                    # Full rerun so the sidebar shows the updated progress
                     st.rerun()
+                else:
+                    # Prefetch the next question while the user reads the feedback
+                    st.session_state.next_question = (
+                        (selected_topic, difficulty, st.session_state.language),
+                        service.submit(service.agenerate_question(
+                            selected_topic,
+                            difficulty,
+                            st.session_state.language,
+                            st.session_state.previous_questions + [st.session_state.current_question]
+                        ))
+                    )
         
         # Next question button
         if st.session_state.answer_submitted and st.session_state.questions_asked < Config.QUESTIONS_PER_SESSION:
-            if col2.button("Next Question" if st.session_state.language == "EN" else "Следующий вопрос"):
+            if col2.button(t["next_question"]):
                 get_next_question()
 
+def main():
+    st.title("Data Science Interview Coach 🎓")
+    
+    # Initialize service and session state
+    service = get_service()
+    initialize_session_state()
+    
+    # Sidebar for settings
+    st.sidebar.header("Interview Settings")
+    
+    # Language selection
+    selected_language = st.sidebar.selectbox(
+        "Select Language / Выберите язык",
+        list(Config.LANGUAGES.keys()),
+        format_func=lambda x: x,
+        index=0 if st.session_state.language == "EN" else 1
+    )
+    st.session_state.language = Config.LANGUAGES[selected_language]
+    t = I18N[st.session_state.language]
+    
+    # Topic and difficulty selection
+    selected_topic = st.sidebar.selectbox(
+        t["select_topic"],
+        Config.TOPICS
+    )
+    difficulty = st.sidebar.selectbox(
+        t["select_difficulty"],
+        Config.DIFFICULTY_LEVELS
+    )
+    
+    # Show previous progress if available
+    progress = service.get_topic_progress(selected_topic, st.session_state.language)
+    if progress:
+        st.sidebar.markdown("---")
+        st.sidebar.subheader(t["your_progress"])
+        st.sidebar.write(f"{t['current_level']}: {progress.skill_level}")
+        st.sidebar.write(f"{t['confidence_score']}: {progress.confidence_score:.2f}")
+        st.sidebar.markdown("**" + t["recommended_topics"] + ":**")
+        for topic in progress.recommended_topics:
+            st.sidebar.markdown(f"- {topic}")
+    
+    question_fragment(service, selected_topic, difficulty)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
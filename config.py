@@ -8,6 +8,15 @@ class Config:
     OPENAI_API_KEY = os.getenv('OPEN_AI_API_KEY')
     OPENAI_MODEL = os.getenv('OPEN_AI_MODEL', 'gpt-3.5-turbo')  # Default model if not specified
     
+    # Per-task models: grading and analysis use a smaller, faster model by default
+    OPENAI_MODEL_GENERATE = os.getenv('OPEN_AI_MODEL_GENERATE', OPENAI_MODEL)
+    OPENAI_MODEL_EVALUATE = os.getenv('OPEN_AI_MODEL_EVALUATE', 'gpt-4o-mini')
+    OPENAI_MODEL_ANALYZE = os.getenv('OPEN_AI_MODEL_ANALYZE', 'gpt-4o-mini')
+    
+    # Output token caps to bound tail latency; evaluation leaves headroom for verbose Russian feedback
+    MAX_TOKENS_EVALUATE = 1000
+    MAX_TOKENS_ANALYZE = 300
+    
     LANGUAGES = {
         "English": "EN",
         "Russian": "RU"
@@ -22,8 +31,32 @@ class Config:
     
     DIFFICULTY_LEVELS = ["Beginner", "Intermediate", "Advanced"]
     
+    # Maximum number of concurrent OpenAI requests
+    MAX_CONCURRENT_REQUESTS = 10
+    
+    # Keep-alive settings for the OpenAI HTTP connection pool
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+    HTTP_KEEPALIVE_EXPIRY = 60.0
+    
     # Number of questions per session
     QUESTIONS_PER_SESSION = 5
     
+    # Maximum number of mastered subtopics kept per topic
+    MAX_MASTERED_SUBTOPICS = 50
+    
+    # Limits on history included in the question generation prompt
+    PROMPT_PREVIOUS_QUESTIONS_LIMIT = 10
+    PROMPT_MASTERED_SUBTOPICS_LIMIT = 20
+    
     # History file path - store in user's home directory
-    HISTORY_FILE = str(Path.cwd() / "interview_history.json") 
\ No newline at end of file
+    HISTORY_FILE = str(Path.cwd() / "interview_history.db")
+    
+    # Seconds a loaded progress record is reused before re-reading the history
+    PROGRESS_CACHE_TTL = 60
+    
+    # Sentence-transformer model used for semantic cache lookups and its output size
+    EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+    EMBEDDING_DIMENSION = 384
+    
+    # Minimum cosine similarity for a semantic cache hit
+    SEMANTIC_CACHE_THRESHOLD = 0.95 
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, PrivateAttr
+from typing import List, Optional, Set, Union
 from datetime import datetime
 
 class InterviewSession(BaseModel):
@@ -21,6 +21,19 @@ class UserProgress(BaseModel):
     recommended_topics: List[str]
     mastered_subtopics: List[str] = []  # Track overall mastered subtopics
     subtopic_scores: dict[str, float] = {}  # Track proficiency scores for each subtopic
+    _mastered_set: Set[str] = PrivateAttr(default_factory=set)  # Fast membership checks for mastered_subtopics
+    
+    def model_post_init(self, __context):
+        self._mastered_set = set(self.mastered_subtopics)
+    
+    def add_mastered_subtopic(self, subtopic: str, limit: int):
+        if subtopic in self._mastered_set:
+            return
+        self._mastered_set.add(subtopic)
+        self.mastered_subtopics.append(subtopic)
+        # Drop the oldest entries once the limit is exceeded
+        while len(self.mastered_subtopics) > limit:
+            self._mastered_set.discard(self.mastered_subtopics.pop(0))
     
 class Question(BaseModel):
     question_text: str
@@ -28,4 +41,15 @@ class Question(BaseModel):
     explanation: str
     difficulty: str
     topic: str
-    subtopic: str 
\ No newline at end of file
+    subtopic: str
+    
+class AnswerEvaluation(BaseModel):
+    is_correct: bool
+    explanation: str
+    improvement_tips: Union[str, List[str]]
+    subtopic_score: float
+    
+class PerformanceAnalysis(BaseModel):
+    skill_level: str
+    confidence_score: float
+    recommended_topics: List[str] 
\ No newline at end of file
@@ -1,121 +1,387 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, NOT_GIVEN
+import asyncio
+import atexit
+import functools
+import hashlib
+import httpx
 import json
+import logging
+import queue
+import re
+import sqlite3
+import string
+import threading
+import time
+import numpy as np
+import orjson
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict
+from pathlib import Path
+from typing import Any, Callable, Coroutine, List, Dict, Optional, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt
 from config import Config
-from models import Question, InterviewSession, UserProgress
+from models import Question, InterviewSession, UserProgress, AnswerEvaluation, PerformanceAnalysis
+
+logger = logging.getLogger(__name__)
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+# Raised when a response hits its output token cap. Not retried, since the same
+# prompt and cap would be cut off again.
+class ResponseTruncatedError(Exception):
+    pass
+
+# Retry once when the model returns JSON that doesn't match the expected schema
+retry_on_invalid_response = retry(
+    stop=stop_after_attempt(2),
+    retry=retry_if_exception_type(ValidationError),
+    reraise=True
+)
+
+LANGUAGE_PROMPTS = {
+    "EN": "Answer in English language.",
+    "RU": "Answer in Russian language."
+}
+
+GENERATE_QUESTION_PROMPT = """Generate an interview question for a Data Scientist position with the following criteria:
+Topic: $topic
+Difficulty: $difficulty
+
+$mastered_subtopics_text
+$previous_questions_text
+Important requirements:
+1. The question must cover a different subtopic than any previous question listed above
+2. DO NOT generate questions about mastered subtopics listed above
+3. The question should be unique in both content and the specific skills it tests
+4. Choose a subtopic that the student hasn't mastered yet
+
+Format the response as a JSON with the following fields:
+- question_text
+- correct_answer
+- explanation
+- difficulty
+- topic
+- subtopic"""
+
+EVALUATE_ANSWER_PROMPT = """Question: $question_text
+Correct Answer: $correct_answer
+User's Answer: $user_answer
+Subtopic: $subtopic
+
+Evaluate the user's answer and provide:
+1. Whether it's correct (true/false)
+2. A detailed explanation
+3. Additional tips for improvement
+4. Proficiency score for this subtopic (0.0 to 1.0)
+
+Format the response as JSON with fields: explanation, improvement_tips, is_correct, subtopic_score"""
+
+ANALYZE_PERFORMANCE_PROMPT = """Based on the following interview session data:
+Topic: $topic
+Questions Asked: $questions_asked
+Correct Answers: $correct_answers
+Difficulty Level: $difficulty_level
+
+Provide:
+1. Current skill level (Beginner/Intermediate/Advanced)
+2. Confidence score (0-1)
+3. List of recommended topics for improvement
+
+Format the response as JSON with fields: skill_level, confidence_score, recommended_topics"""
+
+def _specialize_prompt(prompt: str) -> Dict[str, string.Template]:
+    # Bake the language instruction into each prompt once, at import time
+    return {language: string.Template(f"{lang_prompt}\n{prompt}") for language, lang_prompt in LANGUAGE_PROMPTS.items()}
+
+GENERATE_QUESTION_TEMPLATES = _specialize_prompt(GENERATE_QUESTION_PROMPT)
+EVALUATE_ANSWER_TEMPLATES = _specialize_prompt(EVALUATE_ANSWER_PROMPT)
+ANALYZE_PERFORMANCE_TEMPLATES = _specialize_prompt(ANALYZE_PERFORMANCE_PROMPT)
+
+# Evaluation fields shown to the user while the response is still streaming
+STREAMED_EVALUATION_FIELDS = ("explanation", "improvement_tips")
+
+def _extract_partial_string(buffer: str, field: str) -> Optional[str]:
+    # Decode the value of a string field from JSON that may still be arriving
+    match = re.search(rf'"{field}"\s*:\s*"', buffer)
+    if not match:
+        return None
+    start = pos = match.end()
+    while pos < len(buffer) and buffer[pos] != '"':
+        if buffer[pos] == "\\":
+            length = 6 if buffer[pos + 1:pos + 2] == "u" else 2
+            if pos + length > len(buffer):
+                break  # Escape sequence not fully received yet
+            pos += length
+        else:
+            pos += 1
+    try:
+        value = json.loads(f'"{buffer[start:pos]}"', strict=False)
+    except ValueError:
+        return None
+    # A high surrogate whose low half hasn't arrived yet can't be encoded, so hold it back
+    if value and "\ud800" <= value[-1] <= "\udbff":
+        value = value[:-1]
+    return value
+
+# Background progress writes have no caller to raise to, so failures are logged
+def _log_write_error(future: Future):
+    if not future.cancelled() and future.exception():
+        logger.error("Failed to write progress updates", exc_info=future.exception())
+
+@functools.lru_cache(maxsize=1)
+def _get_embedding_model():
+    # Imported lazily so the model is only loaded on the first semantic lookup
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(Config.EMBEDDING_MODEL)
 
 class InterviewService:
     def __init__(self):
-        self.client = OpenAI(
-            api_key=Config.OPENAI_API_KEY
+        # HTTP/2 with a keep-alive pool avoids repeated TLS handshakes between LLM calls
+        self.client = AsyncOpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+                )
+            )
         )
-        self.history = self._load_history()
-    
-    def _get_language_prompt(self, language: str) -> str:
-        return "Answer in Russian language." if language == "RU" else "Answer in English language."
-    
-    def _serialize_datetime(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
-    
-    def _deserialize_datetime(self, data: Dict) -> Dict:
-        if "sessions" in data:
-            for session in data["sessions"]:
-                if "timestamp" in session:
-                    session["timestamp"] = datetime.fromisoformat(session["timestamp"])
-        if "progress" in data:
-            for progress in data["progress"].values():
-                if "last_session" in progress and progress["last_session"]:
-                    progress["last_session"] = datetime.fromisoformat(progress["last_session"])
-        return data
-    
-    def _load_history(self) -> Dict:
-        try:
-            with open(Config.HISTORY_FILE, 'r') as f:
-                data = json.load(f)
-                return self._deserialize_datetime(data)
-        except FileNotFoundError:
-            return {"sessions": [], "progress": {}}
-    
-    def _save_history(self):
-        with open(Config.HISTORY_FILE, 'w') as f:
-            json.dump(self.history, f, default=self._serialize_datetime, indent=2)
+        # LLM calls run on a dedicated event loop so they can overlap with Streamlit reruns
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+        self._semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        # The service is shared across Streamlit sessions, so history access is serialized
+        self._db_lock = threading.Lock()
+        # Parsed progress per key as (loaded_at, progress), refreshed after PROGRESS_CACHE_TTL seconds
+        self._progress_cache: Dict[str, tuple] = {}
+        # Progress writes are coalesced per key and written off the request path
+        self._pending_progress: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        atexit.register(self.close)
     
-    def generate_question(self, topic: str, difficulty: str, language: str, previous_questions: List[Question] = None) -> Question:
-        lang_prompt = self._get_language_prompt(language)
+    # Write pending progress and release the event loop, writer thread, HTTP client and database
+    def close(self):
+        if self._loop.is_closed():
+            return
+        atexit.unregister(self.close)
+        self._writer.shutdown(wait=True)
+        self.flush()
+        self._run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        if "_db" in self.__dict__:
+            self._db.close()
+    
+    # Schedule a coroutine on the service event loop without waiting for it
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def _run(self, coro: Coroutine) -> Any:
+        return self.submit(coro).result()
+    
+    # History and cache are opened on first use so constructing the service does no I/O
+    @functools.cached_property
+    def _db(self) -> sqlite3.Connection:
+        db = sqlite3.connect(Config.HISTORY_FILE, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS sessions (id INTEGER PRIMARY KEY, topic TEXT, timestamp TEXT, data JSON)")
+        db.execute("CREATE TABLE IF NOT EXISTS progress (key TEXT PRIMARY KEY, data JSON)")
+        db.execute("CREATE TABLE IF NOT EXISTS response_cache (key TEXT PRIMARY KEY, scope TEXT, embedding BLOB, response TEXT)")
+        db.execute("CREATE INDEX IF NOT EXISTS response_cache_scope ON response_cache (scope)")
+        self._import_legacy_history(db)
+        return db
+    
+    def _import_legacy_history(self, db: sqlite3.Connection):
+        # One-time import of the JSON history file used before the SQLite store
+        legacy_file = Path(Config.HISTORY_FILE).with_suffix(".json")
+        if not legacy_file.exists() or db.execute("SELECT 1 FROM sessions UNION ALL SELECT 1 FROM progress LIMIT 1").fetchone():
+            return
+        data = orjson.loads(legacy_file.read_bytes())
+        with db:
+            db.execute("BEGIN")
+            db.executemany(
+                "INSERT INTO sessions (topic, timestamp, data) VALUES (?, ?, ?)",
+                [(session["topic"], session["timestamp"], orjson.dumps(session).decode()) for session in data.get("sessions", [])]
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO progress (key, data) VALUES (?, ?)",
+                [(key, orjson.dumps(progress).decode()) for key, progress in data.get("progress", {}).items()]
+            )
+    
+    # Only used with _db_lock held; built from the cache table on the first semantic lookup
+    @functools.cached_property
+    def _embedding_index(self):
+        # Imported lazily, like the embedding model, since only semantic lookups need it
+        import faiss
+        # Cache row ids double as index ids, so a response and its embedding are stored in one row
+        index = faiss.IndexIDMap(faiss.IndexFlatIP(Config.EMBEDDING_DIMENSION))
+        rows = self._db.execute("SELECT rowid, embedding FROM response_cache WHERE embedding IS NOT NULL").fetchall()
+        if rows:
+            index.add_with_ids(
+                np.vstack([np.frombuffer(embedding, dtype=np.float32) for _, embedding in rows]),
+                np.array([rowid for rowid, _ in rows], dtype=np.int64)
+            )
+        return index
+    
+    def _lookup_response(self, key: str) -> Optional[str]:
+        with self._db_lock:
+            row = self._db.execute("SELECT response FROM response_cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _store_response(self, key: str, response: str, scope: Optional[str], embedding: Optional[np.ndarray]):
+        with self._db_lock:
+            cursor = self._db.execute(
+                "INSERT OR REPLACE INTO response_cache (key, scope, embedding, response) VALUES (?, ?, ?, ?)",
+                (key, scope, embedding.tobytes() if embedding is not None else None, response)
+            )
+            if embedding is not None:
+                self._embedding_index.add_with_ids(embedding.reshape(1, -1), np.array([cursor.lastrowid], dtype=np.int64))
+    
+    def _cache_key(self, prompt: str) -> str:
+        normalized = " ".join(prompt.split())
+        return hashlib.sha256(normalized.encode()).hexdigest()
+    
+    def _embed(self, prompt: str) -> np.ndarray:
+        return _get_embedding_model().encode(prompt, normalize_embeddings=True).astype(np.float32)
+    
+    def _semantic_lookup(self, scope: str, embedding: np.ndarray) -> Optional[str]:
+        import faiss
+        with self._db_lock:
+            # Only responses cached under the same scope are candidates
+            scope_ids = [row[0] for row in self._db.execute(
+                "SELECT rowid FROM response_cache WHERE scope = ? AND embedding IS NOT NULL", (scope,)
+            )]
+            if not scope_ids:
+                return None
+            # Embeddings are L2-normalized, so inner product search ranks by cosine similarity
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(np.array(scope_ids, dtype=np.int64)))
+            scores, ids = self._embedding_index.search(embedding.reshape(1, -1), 1, params=params)
+            if ids[0][0] < 0 or scores[0][0] < Config.SEMANTIC_CACHE_THRESHOLD:
+                return None
+            row = self._db.execute("SELECT response FROM response_cache WHERE rowid = ?", (int(ids[0][0]),)).fetchone()
+        return row[0] if row else None
+    
+    async def _acomplete(self, prompt: str, model: str, max_tokens: Optional[int] = None, on_content: Optional[Callable[[str], None]] = None) -> str:
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens if max_tokens is not None else NOT_GIVEN,
+                response_format={"type": "json_object"},
+                stream=on_content is not None
+            )
+            if on_content is None:
+                content = response.choices[0].message.content
+                finish_reason = response.choices[0].finish_reason
+            else:
+                # Report the accumulated content after every streamed chunk
+                content = ""
+                finish_reason = None
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    if chunk.choices[0].delta.content:
+                        content += chunk.choices[0].delta.content
+                        on_content(content)
+                    if chunk.choices[0].finish_reason:
+                        finish_reason = chunk.choices[0].finish_reason
+        if finish_reason == "length":
+            raise ResponseTruncatedError(f"Response from {model} was cut off at {max_tokens} tokens")
+        return content
+    
+    async def _acached_complete(self, prompt: str, response_model: Type[ResponseModel], model: str, max_tokens: Optional[int] = None, semantic_scope: Optional[str] = None, semantic_text: Optional[str] = None, on_content: Optional[Callable[[str], None]] = None) -> ResponseModel:
+        # Exact match on the normalized prompt first. If allowed, then a near-duplicate
+        # semantic_text among responses whose semantic_scope matches exactly.
+        # Cache reads and writes run off the event loop so they never stall other requests.
+        key = self._cache_key(prompt)
+        cached = await asyncio.to_thread(self._lookup_response, key)
+        scope = self._cache_key(semantic_scope) if semantic_scope is not None else None
+        embedding = None
+        if cached is None and scope is not None:
+            embedding = await asyncio.to_thread(self._embed, semantic_text)
+            cached = await asyncio.to_thread(self._semantic_lookup, scope, embedding)
+        if cached is not None:
+            if on_content:
+                on_content(cached)
+            return response_model.model_validate_json(cached)
         
-        # Get user progress to check mastered subtopics
-        progress = self.get_topic_progress(topic, language)
+        content = await self._acomplete(prompt, model, max_tokens, on_content)
+        # Validate before caching so a malformed response is never replayed
+        result = response_model.model_validate_json(content)
+        
+        await asyncio.to_thread(self._store_response, key, content, scope, embedding)
+        return result
+    
+    @retry_on_invalid_response
+    async def agenerate_question(self, topic: str, difficulty: str, language: str, previous_questions: List[Question] = None) -> Question:
+        # Get user progress to check mastered subtopics, keeping only the most recent ones
+        progress = await asyncio.to_thread(self.get_topic_progress, topic, language)
         mastered_subtopics_text = ""
         if progress and progress.mastered_subtopics:
             mastered_subtopics_text = "\nMastered subtopics (avoid these):\n"
-            for subtopic in progress.mastered_subtopics:
+            for subtopic in sorted(set(progress.mastered_subtopics[-Config.PROMPT_MASTERED_SUBTOPICS_LIMIT:])):
                 mastered_subtopics_text += f"- {subtopic}\n"
         
-        # Create a string of previous questions if they exist
+        # List the subtopics of the most recent previous questions
         previous_questions_text = ""
         if previous_questions and len(previous_questions) > 0:
-            previous_questions_text = "\nPrevious questions in this session:\n"
-            for i, q in enumerate(previous_questions, 1):
-                previous_questions_text += f"{i}. Question: {q.question_text}\n   Topic: {q.topic}\n   Subtopic: {q.subtopic}\n"
-        
-        prompt = f"""{lang_prompt}
-        Generate an interview question for a Data Scientist position with the following criteria:
-        Topic: {topic}
-        Difficulty: {difficulty}
+            previous_questions_text = "\nSubtopics of previous questions in this session:\n"
+            recent_subtopics = dict.fromkeys(q.subtopic for q in previous_questions[-Config.PROMPT_PREVIOUS_QUESTIONS_LIMIT:])
+            for i, subtopic in enumerate(recent_subtopics, 1):
+                previous_questions_text += f"{i}. {subtopic}\n"
         
-        {mastered_subtopics_text}
-        {previous_questions_text}
-        Important requirements:
-        1. The question must be significantly different from any previous questions shown above
-        2. If previous questions covered certain subtopics, focus on different subtopics
-        3. DO NOT generate questions about mastered subtopics listed above
-        4. The question should be unique in both content and the specific skills it tests
-        5. Choose a subtopic that the student hasn't mastered yet
-        
-        Format the response as a JSON with the following fields:
-        - question_text
-        - correct_answer
-        - explanation
-        - difficulty
-        - topic
-        - subtopic"""
-        
-        response = self.client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}]
+        prompt = GENERATE_QUESTION_TEMPLATES[language].substitute(
+            topic=topic,
+            difficulty=difficulty,
+            mastered_subtopics_text=mastered_subtopics_text,
+            previous_questions_text=previous_questions_text
         )
         
-        question_data = json.loads(response.choices[0].message.content)
-        return Question(**question_data)
-    
-    def evaluate_answer(self, question: Question, user_answer: str, language: str) -> Dict:
-        lang_prompt = self._get_language_prompt(language)
-        prompt = f"""{lang_prompt}
-        Question: {question.question_text}
-        Correct Answer: {question.correct_answer}
-        User's Answer: {user_answer}
-        Subtopic: {question.subtopic}
-        
-        Evaluate the user's answer and provide:
-        1. Whether it's correct (true/false)
-        2. A detailed explanation
-        3. Additional tips for improvement
-        4. Proficiency score for this subtopic (0.0 to 1.0)
-        
-        Format the response as JSON with fields: is_correct, explanation, improvement_tips, subtopic_score"""
+        # Not cached: the same settings must still produce a fresh question each session
+        return Question.model_validate_json(await self._acomplete(prompt, Config.OPENAI_MODEL_GENERATE))
+    
+    def generate_question(self, topic: str, difficulty: str, language: str, previous_questions: List[Question] = None) -> Question:
+        return self._run(self.agenerate_question(topic, difficulty, language, previous_questions))
+    
+    @retry_on_invalid_response
+    async def aevaluate_answer(self, question: Question, user_answer: str, language: str, on_partial: Optional[Callable[[Dict[str, Optional[str]]], None]] = None) -> Dict:
+        prompt = EVALUATE_ANSWER_TEMPLATES[language].substitute(
+            question_text=question.question_text,
+            correct_answer=question.correct_answer,
+            user_answer=user_answer,
+            subtopic=question.subtopic
+        )
         
-        response = self.client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}]
+        # A cached grade is only reused for the same question and a near-identical answer
+        semantic_scope = EVALUATE_ANSWER_TEMPLATES[language].substitute(
+            question_text=question.question_text,
+            correct_answer=question.correct_answer,
+            user_answer="",
+            subtopic=question.subtopic
         )
         
-        evaluation = json.loads(response.choices[0].message.content)
+        # Text fields come first in the response so they can be shown while streaming
+        on_content = None
+        if on_partial:
+            on_content = lambda content: on_partial({field: _extract_partial_string(content, field) for field in STREAMED_EVALUATION_FIELDS})
+        evaluation = (await self._acached_complete(
+            prompt,
+            AnswerEvaluation,
+            Config.OPENAI_MODEL_EVALUATE,
+            max_tokens=Config.MAX_TOKENS_EVALUATE,
+            semantic_scope=semantic_scope,
+            semantic_text=user_answer,
+            on_content=on_content
+        )).model_dump()
         
-        # Update progress with subtopic score
-        progress = self.get_topic_progress(question.topic, language)
+        # Update progress with subtopic score once the full evaluation has arrived
+        progress = await asyncio.to_thread(self.get_topic_progress, question.topic, language)
         if progress:
             subtopic = question.subtopic
             current_score = progress.subtopic_scores.get(subtopic, 0.0)
@@ -124,18 +390,28 @@ class InterviewService:
             
             # If subtopic score is high enough, mark it as mastered
             if new_score >= 0.85:  # 85% proficiency threshold
-                if subtopic not in progress.mastered_subtopics:
-                    progress.mastered_subtopics.append(subtopic)
+                progress.add_mastered_subtopic(subtopic, Config.MAX_MASTERED_SUBTOPICS)
             
             self.update_progress(progress)
         
         return evaluation
     
-    def analyze_performance(self, topic: str, session_data: InterviewSession, language: str) -> UserProgress:
-        lang_prompt = self._get_language_prompt(language)
+    def evaluate_answer(self, question: Question, user_answer: str, language: str, on_partial: Optional[Callable[[Dict[str, Optional[str]]], None]] = None) -> Dict:
+        if on_partial is None:
+            return self._run(self.aevaluate_answer(question, user_answer, language))
         
+        # Hand partial results back to the calling thread so Streamlit elements can be updated
+        partials = queue.Queue()
+        future = self.submit(self.aevaluate_answer(question, user_answer, language, partials.put))
+        future.add_done_callback(lambda _: partials.put(None))
+        for partial in iter(partials.get, None):
+            on_partial(partial)
+        return future.result()
+    
+    @retry_on_invalid_response
+    async def aanalyze_performance(self, topic: str, session_data: InterviewSession, language: str) -> UserProgress:
         # Get existing progress to preserve mastered subtopics
-        existing_progress = self.get_topic_progress(topic, language)
+        existing_progress = await asyncio.to_thread(self.get_topic_progress, topic, language)
         mastered_subtopics = []
         subtopic_scores = {}
         
@@ -143,26 +419,16 @@ class InterviewService:
             mastered_subtopics = existing_progress.mastered_subtopics
             subtopic_scores = existing_progress.subtopic_scores
         
-        prompt = f"""{lang_prompt}
-        Based on the following interview session data:
-        Topic: {topic}
-        Questions Asked: {session_data.questions_asked}
-        Correct Answers: {session_data.correct_answers}
-        Difficulty Level: {session_data.difficulty_level}
-        
-        Provide:
-        1. Current skill level (Beginner/Intermediate/Advanced)
-        2. Confidence score (0-1)
-        3. List of recommended topics for improvement
-        
-        Format the response as JSON with fields: skill_level, confidence_score, recommended_topics"""
-        
-        response = self.client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}]
+        prompt = ANALYZE_PERFORMANCE_TEMPLATES[language].substitute(
+            topic=topic,
+            questions_asked=session_data.questions_asked,
+            correct_answers=session_data.correct_answers,
+            difficulty_level=session_data.difficulty_level
         )
         
-        analysis = json.loads(response.choices[0].message.content)
+        response = await self._acomplete(prompt, Config.OPENAI_MODEL_ANALYZE, Config.MAX_TOKENS_ANALYZE)
+        
+        analysis = PerformanceAnalysis.model_validate_json(response).model_dump()
         return UserProgress(
             topic=topic,
             last_session=datetime.now(),
@@ -172,18 +438,68 @@ class InterviewService:
             **analysis
         )
     
+    def analyze_performance(self, topic: str, session_data: InterviewSession, language: str) -> UserProgress:
+        return self._run(self.aanalyze_performance(topic, session_data, language))
+    
     def save_session(self, session: InterviewSession):
         session_dict = session.model_dump()
-        self.history["sessions"].append(session_dict)
-        self._save_history()
+        with self._db_lock:
+            self._db.execute(
+                "INSERT INTO sessions (topic, timestamp, data) VALUES (?, ?, ?)",
+                (session.topic, session.timestamp.isoformat(), orjson.dumps(session_dict).decode())
+            )
     
     def update_progress(self, progress: UserProgress):
         key = f"{progress.topic}_{progress.language}"
-        self.history["progress"][key] = progress.model_dump()
-        self._save_history()
+        data = orjson.dumps(progress.model_dump()).decode()
+        # Reads are served from memory until the background write lands; a copy keeps later
+        # changes to the caller's object out of the cache. Both are set under one lock so
+        # readers can tell when the stored row is older than the cached entry.
+        with self._pending_lock:
+            self._progress_cache[key] = (time.monotonic(), progress.model_copy(deep=True))
+            self._pending_progress[key] = data
+        self._writer.submit(self.flush).add_done_callback(_log_write_error)
+    
+    # Write all queued progress updates; waits for any write already in progress
+    def flush(self):
+        with self._db_lock:
+            with self._pending_lock:
+                pending, self._pending_progress = self._pending_progress, {}
+            if not pending:
+                return
+            try:
+                with self._db:
+                    self._db.execute("BEGIN")
+                    self._db.executemany("INSERT OR REPLACE INTO progress (key, data) VALUES (?, ?)", pending.items())
+            except sqlite3.Error:
+                # Queue the rows again for the next flush, keeping any newer update for the same key
+                with self._pending_lock:
+                    self._pending_progress = {**pending, **self._pending_progress}
+                raise
+    
+    def get_sessions(self) -> List[InterviewSession]:
+        with self._db_lock:
+            rows = self._db.execute("SELECT data FROM sessions ORDER BY id").fetchall()
+        return [InterviewSession.model_validate_json(data) for (data,) in rows]
     
     def get_topic_progress(self, topic: str, language: str) -> UserProgress:
         key = f"{topic}_{language}"
-        if key in self.history["progress"]:
-            return UserProgress(**self.history["progress"][key])
-        return None 
\ No newline at end of file
+        cached = self._progress_cache.get(key)
+        if cached and time.monotonic() - cached[0] < Config.PROGRESS_CACHE_TTL:
+            # Callers get their own copy, so editing it can't change the cached entry
+            return cached[1].model_copy(deep=True) if cached[1] else None
+        
+        with self._db_lock:
+            row = self._db.execute("SELECT data FROM progress WHERE key = ?", (key,)).fetchone()
+        progress = None
+        if row:
+            # Parse the stored JSON text directly instead of going through a dict
+            progress = UserProgress.model_validate_json(row[0])
+        with self._pending_lock:
+            current = self._progress_cache.get(key)
+            # An update made during the read, or one not yet written, is newer than the row
+            if current is not cached or key in self._pending_progress:
+                progress = current[1]
+            else:
+                self._progress_cache[key] = (time.monotonic(), progress)
+        return progress.model_copy(deep=True) if progress else None 
\ No newline at end of file
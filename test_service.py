@@ -3,10 +3,13 @@ from datetime import datetime
 from pathlib import Path
 import json
 import os
-from service import InterviewService
-from models import InterviewSession, UserProgress, Question
+import sqlite3
+from unittest import mock
+from service import InterviewService, ResponseTruncatedError, _extract_partial_string
+from models import InterviewSession, UserProgress, Question, AnswerEvaluation
 from config import Config
 import logging
+import numpy as np
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -16,7 +19,7 @@ class TestInterviewService(unittest.TestCase):
     def setUp(self):
         logger.info("Setting up test environment...")
         # Create a temporary history file for testing
-        self.test_history_file = "test_history.json"
+        self.test_history_file = "test_history.db"
         Config.HISTORY_FILE = self.test_history_file
         logger.debug(f"Using test history file: {self.test_history_file}")
         logger.debug(f"OpenAI API Key present: {'Yes' if Config.OPENAI_API_KEY else 'No'}")
@@ -24,10 +27,18 @@ class TestInterviewService(unittest.TestCase):
 
     def tearDown(self):
         logger.info("Cleaning up test environment...")
+        self.service.close()
         # Clean up the test history file
-        if os.path.exists(self.test_history_file):
-            os.remove(self.test_history_file)
-            logger.debug(f"Removed test history file: {self.test_history_file}")
+        for path in (self.test_history_file, f"{self.test_history_file}-wal", f"{self.test_history_file}-shm", "test_history.json"):
+            if os.path.exists(path):
+                os.remove(path)
+                logger.debug(f"Removed test history file: {path}")
+
+    def _read_raw_rows(self, table):
+        with sqlite3.connect(self.test_history_file) as conn:
+            if table == "sessions":
+                return [json.loads(data) for (data,) in conn.execute("SELECT data FROM sessions ORDER BY id")]
+            return {key: json.loads(data) for key, data in conn.execute("SELECT key, data FROM progress")}
 
     def test_save_and_load_session_with_datetime(self):
         logger.info("Testing save and load session with datetime...")
@@ -52,14 +63,13 @@ class TestInterviewService(unittest.TestCase):
             self.assertTrue(os.path.exists(self.test_history_file))
             logger.debug("History file exists")
 
-            # Read the raw JSON to verify datetime serialization
-            with open(self.test_history_file, 'r') as f:
-                raw_data = json.load(f)
-                logger.debug(f"Raw JSON data: {raw_data}")
+            # Read the raw rows to verify datetime serialization
+            raw_sessions = self._read_raw_rows("sessions")
+            logger.debug(f"Raw session rows: {raw_sessions}")
             
             # Check if the session was saved
-            self.assertEqual(len(raw_data["sessions"]), 1)
-            saved_session = raw_data["sessions"][0]
+            self.assertEqual(len(raw_sessions), 1)
+            saved_session = raw_sessions[0]
             logger.debug(f"Saved session data: {saved_session}")
 
             # Verify datetime was serialized as string
@@ -68,11 +78,12 @@ class TestInterviewService(unittest.TestCase):
 
             # Load the history again
             new_service = InterviewService()
-            loaded_session = new_service.history["sessions"][0]
+            self.addCleanup(new_service.close)
+            loaded_session = new_service.get_sessions()[0]
             logger.debug(f"Loaded session data: {loaded_session}")
 
             # Verify datetime was deserialized
-            self.assertIsInstance(loaded_session["timestamp"], datetime)
+            self.assertIsInstance(loaded_session.timestamp, datetime)
             logger.debug("Test completed successfully")
         except Exception as e:
             logger.error(f"Test failed with error: {str(e)}")
@@ -94,21 +105,21 @@ class TestInterviewService(unittest.TestCase):
 
             # Save the progress
             self.service.update_progress(progress)
+            self.service.flush()
             logger.debug("Progress saved successfully")
 
             # Verify the file exists
             self.assertTrue(os.path.exists(self.test_history_file))
             logger.debug("History file exists")
 
-            # Read the raw JSON to verify datetime serialization
-            with open(self.test_history_file, 'r') as f:
-                raw_data = json.load(f)
-                logger.debug(f"Raw JSON data: {raw_data}")
+            # Read the raw rows to verify datetime serialization
+            raw_progress = self._read_raw_rows("progress")
+            logger.debug(f"Raw progress rows: {raw_progress}")
             
             # Check if the progress was saved
             key = f"{progress.topic}_{progress.language}"
-            self.assertIn(key, raw_data["progress"])
-            saved_progress = raw_data["progress"][key]
+            self.assertIn(key, raw_progress)
+            saved_progress = raw_progress[key]
             logger.debug(f"Saved progress data: {saved_progress}")
 
             # Verify datetime was serialized as string
@@ -117,6 +128,7 @@ class TestInterviewService(unittest.TestCase):
 
             # Load the history again
             new_service = InterviewService()
+            self.addCleanup(new_service.close)
             loaded_progress = new_service.get_topic_progress("Python", "EN")
             logger.debug(f"Loaded progress data: {loaded_progress}")
 
@@ -156,21 +168,121 @@ class TestInterviewService(unittest.TestCase):
                 )
                 self.service.update_progress(progress)
                 logger.debug(f"Saved progress {i}: {progress}")
+            self.service.flush()
 
-            # Read the raw JSON
-            with open(self.test_history_file, 'r') as f:
-                raw_data = json.load(f)
-                logger.debug(f"Raw JSON data: {raw_data}")
+            # Read the raw rows
+            raw_sessions = self._read_raw_rows("sessions")
+            raw_progress = self._read_raw_rows("progress")
+            logger.debug(f"Raw rows: {raw_sessions}, {raw_progress}")
             
             # Verify multiple sessions were saved
-            self.assertEqual(len(raw_data["sessions"]), 3)
-            self.assertEqual(len(raw_data["progress"]), 3)
-            logger.debug(f"Verified counts: {len(raw_data['sessions'])} sessions, {len(raw_data['progress'])} progress entries")
+            self.assertEqual(len(raw_sessions), 3)
+            self.assertEqual(len(raw_progress), 3)
+            logger.debug(f"Verified counts: {len(raw_sessions)} sessions, {len(raw_progress)} progress entries")
 
             # Load and verify all data
             new_service = InterviewService()
-            self.assertEqual(len(new_service.history["sessions"]), 3)
-            self.assertEqual(len(new_service.history["progress"]), 3)
+            self.addCleanup(new_service.close)
+            self.assertEqual(len(new_service.get_sessions()), 3)
+            for i in range(3):
+                self.assertIsNotNone(new_service.get_topic_progress(f"Topic{i}", "EN"))
+            logger.debug("Test completed successfully")
+        except Exception as e:
+            logger.error(f"Test failed with error: {str(e)}")
+            raise
+
+    def test_history_opened_lazily(self):
+        logger.info("Testing lazy history access...")
+        # Constructing the service must not touch the history file
+        self.assertFalse(os.path.exists(self.test_history_file))
+
+        self.assertIsNone(self.service.get_topic_progress("Python", "EN"))
+        self.assertTrue(os.path.exists(self.test_history_file))
+        logger.debug("Test completed successfully")
+
+    def test_failed_progress_write_is_logged_and_kept(self):
+        logger.info("Testing failed background progress write...")
+        progress = UserProgress(
+            topic="Python",
+            skill_level="Beginner",
+            confidence_score=0.4,
+            last_session=datetime.now(),
+            language="EN",
+            recommended_topics=[]
+        )
+        failing_db = mock.MagicMock()
+        failing_db.executemany.side_effect = sqlite3.OperationalError("database is locked")
+        with mock.patch.object(self.service, "_db", failing_db), self.assertLogs("service", level="ERROR"):
+            self.service.update_progress(progress)
+            # Wait for the background write to finish
+            self.service._writer.submit(lambda: None).result()
+
+        # The failed rows are written by the next flush
+        self.service.flush()
+        self.assertIn("Python_EN", self._read_raw_rows("progress"))
+        logger.debug("Test completed successfully")
+
+    def test_close_writes_pending_progress(self):
+        logger.info("Testing service shutdown...")
+        progress = UserProgress(
+            topic="Python",
+            skill_level="Beginner",
+            confidence_score=0.4,
+            last_session=datetime.now(),
+            language="EN",
+            recommended_topics=[]
+        )
+        self.service.update_progress(progress)
+        self.service.close()
+
+        # Pending writes land before the event loop thread is stopped
+        self.assertIn("Python_EN", self._read_raw_rows("progress"))
+        self.assertFalse(self.service._loop_thread.is_alive())
+        self.assertTrue(self.service._loop.is_closed())
+        logger.debug("Test completed successfully")
+
+    def test_import_legacy_json_history(self):
+        logger.info("Testing import of legacy JSON history...")
+        try:
+            # Write a history file in the pre-SQLite format next to a fresh database
+            legacy_data = {
+                "sessions": [{
+                    "topic": "SQL",
+                    "timestamp": datetime.now().isoformat(),
+                    "questions_asked": 5,
+                    "correct_answers": 4,
+                    "difficulty_level": "Beginner",
+                    "language": "EN",
+                    "areas_for_improvement": ["Joins"],
+                    "mastered_subtopics": []
+                }],
+                "progress": {
+                    "SQL_EN": {
+                        "topic": "SQL",
+                        "skill_level": "Beginner",
+                        "confidence_score": 0.8,
+                        "last_session": datetime.now().isoformat(),
+                        "language": "EN",
+                        "recommended_topics": ["Window functions"]
+                    }
+                }
+            }
+            with open("test_history.json", 'w') as f:
+                json.dump(legacy_data, f)
+
+            new_service = InterviewService()
+            self.addCleanup(new_service.close)
+            sessions = new_service.get_sessions()
+            progress = new_service.get_topic_progress("SQL", "EN")
+            logger.debug(f"Imported data: {sessions}, {progress}")
+
+            self.assertEqual(len(sessions), 1)
+            self.assertEqual(sessions[0].correct_answers, 4)
+            self.assertEqual(progress.confidence_score, 0.8)
+
+            # The import only happens once
+            InterviewService().close()
+            self.assertEqual(len(new_service.get_sessions()), 1)
             logger.debug("Test completed successfully")
         except Exception as e:
             logger.error(f"Test failed with error: {str(e)}")
@@ -233,5 +345,353 @@ class TestInterviewService(unittest.TestCase):
             logger.error(f"Test failed with error: {str(e)}")
             raise
 
+    def _mock_completion(self, content, finish_reason="stop"):
+        response = mock.Mock()
+        response.choices = [mock.Mock(message=mock.Mock(content=content), finish_reason=finish_reason)]
+        return response
+
+    def test_cached_complete_exact_match(self):
+        logger.info("Testing exact-match response cache...")
+        try:
+            evaluation_json = json.dumps({
+                "explanation": "Correct",
+                "improvement_tips": "None",
+                "is_correct": True,
+                "subtopic_score": 0.9
+            })
+            create = mock.AsyncMock(return_value=self._mock_completion(evaluation_json))
+            with mock.patch.object(self.service.client.chat.completions, "create", new=create):
+                first = self.service._run(self.service._acached_complete("What is   the answer?", AnswerEvaluation, Config.OPENAI_MODEL_EVALUATE))
+                # Whitespace differences normalize to the same cache key
+                second = self.service._run(self.service._acached_complete("What is the answer?", AnswerEvaluation, Config.OPENAI_MODEL_EVALUATE))
+            logger.debug(f"Cached responses: {first}, {second}")
+
+            self.assertEqual(first, second)
+            self.assertEqual(create.call_count, 1)
+
+            # The cache is persisted and reused by a new service
+            new_service = InterviewService()
+            self.addCleanup(new_service.close)
+            with mock.patch.object(new_service.client.chat.completions, "create", new=mock.AsyncMock()) as create:
+                self.assertEqual(new_service._run(new_service._acached_complete("What is the answer?", AnswerEvaluation, Config.OPENAI_MODEL_EVALUATE)), first)
+                create.assert_not_called()
+            logger.debug("Test completed successfully")
+        except Exception as e:
+            logger.error(f"Test failed with error: {str(e)}")
+            raise
+
+    def test_cached_complete_semantic_match(self):
+        logger.info("Testing semantic response cache...")
+        try:
+            evaluation_json = json.dumps({
+                "explanation": "Correct",
+                "improvement_tips": "None",
+                "is_correct": True,
+                "subtopic_score": 0.9
+            })
+
+            def unit_vector(*values):
+                vector = np.zeros(Config.EMBEDDING_DIMENSION, dtype=np.float32)
+                vector[:len(values)] = values
+                return vector / np.linalg.norm(vector)
+
+            embeddings = {
+                "original answer": unit_vector(1.0, 0.0),
+                "near-duplicate answer": unit_vector(1.0, 0.05),
+                "unrelated answer": unit_vector(0.0, 1.0)
+            }
+
+            def evaluate(service, question, answer):
+                return service._run(service._acached_complete(
+                    f"{question}: {answer}",
+                    AnswerEvaluation,
+                    Config.OPENAI_MODEL_EVALUATE,
+                    semantic_scope=question,
+                    semantic_text=answer
+                ))
+
+            create = mock.AsyncMock(return_value=self._mock_completion(evaluation_json))
+            with mock.patch.object(self.service.client.chat.completions, "create", new=create), \
+                    mock.patch.object(self.service, "_embed", side_effect=embeddings.get):
+                for question, answer in [
+                    ("question A", "original answer"),
+                    ("question A", "near-duplicate answer"),
+                    ("question A", "unrelated answer"),
+                    ("question B", "original answer")
+                ]:
+                    evaluate(self.service, question, answer)
+
+            # Only a near-duplicate answer to the same question hits the cache
+            self.assertEqual(create.call_count, 3)
+
+            # Embeddings are stored with the cached responses and reused by a new service
+            new_service = InterviewService()
+            self.addCleanup(new_service.close)
+            with mock.patch.object(new_service.client.chat.completions, "create", new=mock.AsyncMock()) as create, \
+                    mock.patch.object(new_service, "_embed", side_effect=embeddings.get):
+                evaluation = evaluate(new_service, "question A", "near-duplicate answer")
+                create.assert_not_called()
+            self.assertTrue(evaluation.is_correct)
+            logger.debug("Test completed successfully")
+        except Exception as e:
+            logger.error(f"Test failed with error: {str(e)}")
+            raise
+
+    def test_invalid_response_is_retried(self):
+        logger.info("Testing retry on invalid LLM response...")
+        try:
+            analysis_json = json.dumps({
+                "skill_level": "Advanced",
+                "confidence_score": 0.9,
+                "recommended_topics": ["Window functions"]
+            })
+            create = mock.AsyncMock(side_effect=[
+                self._mock_completion("Here is your analysis: not JSON"),
+                self._mock_completion(analysis_json)
+            ])
+            session = InterviewSession(
+                topic="SQL",
+                timestamp=datetime.now(),
+                questions_asked=5,
+                correct_answers=5,
+                difficulty_level="Advanced",
+                language="EN",
+                areas_for_improvement=[]
+            )
+            with mock.patch.object(self.service.client.chat.completions, "create", new=create):
+                progress = self.service.analyze_performance("SQL", session, "EN")
+            logger.debug(f"Analyzed progress: {progress}")
+
+            self.assertEqual(create.call_count, 2)
+            self.assertEqual(progress.skill_level, "Advanced")
+            self.assertEqual(create.call_args.kwargs["response_format"], {"type": "json_object"})
+            self.assertEqual(create.call_args.kwargs["model"], Config.OPENAI_MODEL_ANALYZE)
+            self.assertEqual(create.call_args.kwargs["max_tokens"], Config.MAX_TOKENS_ANALYZE)
+            logger.debug("Test completed successfully")
+        except Exception as e:
+            logger.error(f"Test failed with error: {str(e)}")
+            raise
+
+    def test_truncated_response_is_not_retried(self):
+        logger.info("Testing truncated LLM response...")
+        try:
+            question = Question(
+                question_text="What is a generator?",
+                correct_answer="A function that yields values lazily",
+                explanation="Generators produce items on demand",
+                difficulty="Beginner",
+                topic="Python",
+                subtopic="Generators"
+            )
+            create = mock.AsyncMock(return_value=self._mock_completion('{"explanation": "Generators are', finish_reason="length"))
+            with mock.patch.object(self.service.client.chat.completions, "create", new=create), \
+                    mock.patch.object(self.service, "_embed", return_value=np.ones(Config.EMBEDDING_DIMENSION, dtype=np.float32)):
+                with self.assertRaises(ResponseTruncatedError):
+                    self.service.evaluate_answer(question, "They yield values", "EN")
+
+            # The same prompt and cap would be cut off again, so there is no second request
+            self.assertEqual(create.call_count, 1)
+            logger.debug("Test completed successfully")
+        except Exception as e:
+            logger.error(f"Test failed with error: {str(e)}")
+            raise
+
+    def test_evaluate_answer_streams_feedback(self):
+        logger.info("Testing streamed answer evaluation...")
+        try:
+            evaluation_json = json.dumps({
+                "explanation": "Generators yield values lazily.",
+                "improvement_tips": "Mention the yield keyword.",
+                "is_correct": True,
+                "subtopic_score": 0.8
+            })
+
+            async def stream_chunks():
+                for i in range(0, len(evaluation_json), 8):
+                    yield mock.Mock(choices=[mock.Mock(delta=mock.Mock(content=evaluation_json[i:i + 8]), finish_reason=None)])
+
+            create = mock.AsyncMock(return_value=stream_chunks())
+            question = Question(
+                question_text="What is a generator?",
+                correct_answer="A function that yields values lazily",
+                explanation="Generators produce items on demand",
+                difficulty="Beginner",
+                topic="Python",
+                subtopic="Generators"
+            )
+            partials = []
+            with mock.patch.object(self.service.client.chat.completions, "create", new=create), \
+                    mock.patch.object(self.service, "_embed", return_value=np.full(Config.EMBEDDING_DIMENSION, Config.EMBEDDING_DIMENSION ** -0.5, dtype=np.float32)):
+                evaluation = self.service.evaluate_answer(question, "It yields values", "EN", on_partial=partials.append)
+            logger.debug(f"Received {len(partials)} partial results, final evaluation: {evaluation}")
+
+            self.assertTrue(create.call_args.kwargs["stream"])
+            self.assertEqual(create.call_args.kwargs["model"], Config.OPENAI_MODEL_EVALUATE)
+            self.assertTrue(evaluation["is_correct"])
+            # Feedback text grows as the stream arrives
+            explanations = [p["explanation"] for p in partials if p["explanation"]]
+            self.assertGreater(len(explanations), 1)
+            self.assertTrue(evaluation["explanation"].startswith(explanations[0]))
+            self.assertEqual(explanations[-1], evaluation["explanation"])
+            self.assertEqual(partials[-1]["improvement_tips"], evaluation["improvement_tips"])
+            logger.debug("Test completed successfully")
+        except Exception as e:
+            logger.error(f"Test failed with error: {str(e)}")
+            raise
+
+    def test_partial_string_holds_back_split_surrogate_pair(self):
+        logger.info("Testing partial decoding of escaped emoji...")
+        # The low surrogate escape hasn't fully arrived yet
+        partial = _extract_partial_string('{"explanation": "smile \\ud83d\\ude0', "explanation")
+        self.assertEqual(partial, "smile ")
+        # Streamlit encodes markdown as UTF-8, which rejects lone surrogates
+        partial.encode("utf-8")
+
+        complete = _extract_partial_string('{"explanation": "smile \\ud83d\\ude00', "explanation")
+        self.assertEqual(complete, "smile \U0001f600")
+        logger.debug("Test completed successfully")
+
+    def test_generate_question_prompt_is_bounded(self):
+        logger.info("Testing question prompt size limits...")
+        try:
+            progress = UserProgress(
+                topic="Python",
+                skill_level="Advanced",
+                confidence_score=0.9,
+                last_session=datetime.now(),
+                language="EN",
+                recommended_topics=[],
+                mastered_subtopics=[f"Mastered{i}" for i in range(50)]
+            )
+            self.service.update_progress(progress)
+            previous_questions = [
+                Question(
+                    question_text=f"Question {i}",
+                    correct_answer="Answer",
+                    explanation="Explanation",
+                    difficulty="Advanced",
+                    topic="Python",
+                    subtopic=f"Subtopic{i % 15}"
+                )
+                for i in range(30)
+            ]
+
+            complete = mock.AsyncMock(return_value=previous_questions[0].model_dump_json())
+            with mock.patch.object(self.service, "_acomplete", new=complete):
+                self.service.generate_question("Python", "Advanced", "EN", previous_questions)
+                # Questions are never replayed from the cache
+                self.service.generate_question("Python", "Advanced", "EN", previous_questions)
+            self.assertEqual(complete.call_count, 2)
+            prompt = complete.call_args.args[0]
+            logger.debug(f"Generated prompt: {prompt}")
+
+            # Only the latest subtopics are listed, without the question texts
+            self.assertNotIn("Question 29", prompt)
+            self.assertIn("Subtopic14", prompt)
+            self.assertNotIn("Subtopic4\n", prompt)
+            self.assertEqual(prompt.count("Mastered"), Config.PROMPT_MASTERED_SUBTOPICS_LIMIT + 1)
+            self.assertIn("Mastered49", prompt)
+            logger.debug("Test completed successfully")
+        except Exception as e:
+            logger.error(f"Test failed with error: {str(e)}")
+            raise
+
+    def test_topic_progress_cache(self):
+        logger.info("Testing in-process progress cache...")
+        try:
+            progress = UserProgress(
+                topic="Statistics",
+                skill_level="Beginner",
+                confidence_score=0.4,
+                last_session=datetime.now(),
+                language="RU",
+                recommended_topics=["Hypothesis testing"]
+            )
+            self.service.update_progress(progress)
+
+            # Repeated reads return copies, so changes to one don't leak into the cache
+            first = self.service.get_topic_progress("Statistics", "RU")
+            first.add_mastered_subtopic("Sampling", Config.MAX_MASTERED_SUBTOPICS)
+            first.subtopic_scores["Sampling"] = 0.9
+            second = self.service.get_topic_progress("Statistics", "RU")
+            self.assertIsNot(second, first)
+            self.assertEqual(second.mastered_subtopics, [])
+            self.assertEqual(second.subtopic_scores, {})
+
+            # Updating the progress replaces the cached entry
+            self.service.update_progress(progress.model_copy(update={"confidence_score": 0.6}))
+            self.assertEqual(self.service.get_topic_progress("Statistics", "RU").confidence_score, 0.6)
+
+            # Expired entries are re-read from the history
+            self.service.flush()
+            with mock.patch.object(Config, "PROGRESS_CACHE_TTL", 0):
+                reloaded = self.service.get_topic_progress("Statistics", "RU")
+            self.assertIsNot(reloaded, first)
+            self.assertEqual(reloaded.confidence_score, 0.6)
+            logger.debug("Test completed successfully")
+        except Exception as e:
+            logger.error(f"Test failed with error: {str(e)}")
+            raise
+
+    def test_topic_progress_read_does_not_overwrite_newer_update(self):
+        logger.info("Testing concurrent progress read and update...")
+        try:
+            progress = UserProgress(
+                topic="Statistics",
+                skill_level="Beginner",
+                confidence_score=0.4,
+                last_session=datetime.now(),
+                language="RU",
+                recommended_topics=[]
+            )
+            self.service.update_progress(progress)
+            self.service.flush()
+
+            # Another session updates the progress after the stored row was read
+            parse = UserProgress.model_validate_json
+
+            def parse_then_update(data):
+                stored = parse(data)
+                self.service.update_progress(progress.model_copy(update={"confidence_score": 0.6}))
+                return stored
+
+            with mock.patch.object(Config, "PROGRESS_CACHE_TTL", 0), \
+                    mock.patch.object(UserProgress, "model_validate_json", side_effect=parse_then_update):
+                self.assertEqual(self.service.get_topic_progress("Statistics", "RU").confidence_score, 0.6)
+
+            # The stale row was not put back into the cache
+            self.assertEqual(self.service.get_topic_progress("Statistics", "RU").confidence_score, 0.6)
+            logger.debug("Test completed successfully")
+        except Exception as e:
+            logger.error(f"Test failed with error: {str(e)}")
+            raise
+
+    def test_add_mastered_subtopic(self):
+        logger.info("Testing mastered subtopic tracking...")
+        progress = UserProgress(
+            topic="Python",
+            skill_level="Intermediate",
+            confidence_score=0.7,
+            last_session=datetime.now(),
+            language="EN",
+            recommended_topics=[],
+            mastered_subtopics=["Decorators", "Generators"]
+        )
+
+        # Already mastered subtopics are not duplicated
+        progress.add_mastered_subtopic("Decorators", limit=3)
+        progress.add_mastered_subtopic("Closures", limit=3)
+        self.assertEqual(progress.mastered_subtopics, ["Decorators", "Generators", "Closures"])
+
+        # The oldest subtopic is dropped once the limit is exceeded
+        progress.add_mastered_subtopic("Metaclasses", limit=3)
+        self.assertEqual(progress.mastered_subtopics, ["Generators", "Closures", "Metaclasses"])
+        progress.add_mastered_subtopic("Decorators", limit=3)
+        self.assertEqual(progress.mastered_subtopics, ["Closures", "Metaclasses", "Decorators"])
+
+        # Only the list is persisted
+        self.assertNotIn("_mastered_set", progress.model_dump())
+        logger.debug("Test completed successfully")
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file